@@ -9,15 +9,15 @@ if __name__ == "__main__":
 
 # main.py
 import os
-import subprocess
 
 def run_streamlit_app():
     """Lance l'application Streamlit du projet."""
     # Chemin vers ton app Streamlit
     app_path = os.path.join("pricer_project", "interface", "app.py")
 
-    # Lancer Streamlit avec le même interpréteur Python
-    subprocess.run(["streamlit", "run", app_path], check=True)
+    # Lancer Streamlit dans ce processus (pas de fork ni de réimport de l'interpréteur)
+    from streamlit.web import bootstrap
+    bootstrap.run(app_path, False, [], {})
 
 if __name__ == "__main__":
     run_streamlit_app()
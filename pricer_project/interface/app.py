@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 import streamlit as st
 
@@ -8,8 +7,70 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from pricer_project.models.black_scholes import OptionParams, black_scholes_price, delta, gamma, vega, theta, rho
-from pricer_project.models.monte_carlo import monte_carlo_price
+from pricer_project.models.black_scholes import OptionParams, black_scholes_price, all_greeks
+from pricer_project.models.monte_carlo import monte_carlo_price, simulate_paths
+
+
+# --- Cached pricing (évite de recalculer à chaque rerun Streamlit) ---
+# On passe un tuple simple plutôt que l'OptionParams : hashable pour st.cache_data
+# dans toutes les versions de Streamlit.
+@st.cache_data
+def _bs_cached(p_tuple: tuple, kind: str):
+    return black_scholes_price(OptionParams(*p_tuple), kind)
+
+@st.cache_data
+def _greeks_cached(p_tuple: tuple, kind: str):
+    return all_greeks(OptionParams(*p_tuple), kind)
+
+@st.cache_data
+def _mc_cached(p_tuple: tuple, kind: str, n_sims: int, seed: int):
+    return monte_carlo_price(OptionParams(*p_tuple), kind, n_sims=n_sims, seed=seed)
+
+@st.cache_data
+def _convergence_data(p_tuple: tuple, kind: str, seed: int, max_power: int):
+    """Grille, prix et erreurs-types du panneau de convergence.
+
+    Un seul tirage de taille max(grid) : chaque préfixe est un estimateur MC
+    valide, et les cumsum donnent tous les points de la grille en O(N).
+    C'est la partie coûteuse (jusqu'à 1e6 chemins) : elle est mise en cache
+    sur (paramètres, kind, seed, max_power) pour ne pas être rejouée à
+    chaque rerun tant que l'expander est ouvert.
+    """
+    params = OptionParams(*p_tuple)
+    grid = np.unique((np.logspace(2, max_power, num=max_power*5)).astype(int))
+    # Le tampon de chemins est conservé dans la session et réutilisé d'un
+    # recalcul à l'autre tant que sa taille suffit.
+    n_paths = int(grid[-1]) + 1
+    buf = st.session_state.get("_path_buffer")
+    if buf is None or buf.size < n_paths + 1:
+        buf = np.empty(n_paths + 1, dtype=np.float32)
+        st.session_state["_path_buffer"] = buf
+    ST = simulate_paths(params, n_paths, seed, out=buf)
+    payoffs = np.maximum(ST - params.K, 0) if kind == "call" else np.maximum(params.K - ST, 0)
+    csum = np.cumsum(payoffs, dtype=np.float64)
+    csum2 = np.cumsum(payoffs.astype(np.float64)**2)
+    means = csum[grid - 1] / grid
+    variances = np.maximum(csum2[grid - 1] / grid - means**2, 0.0)
+    prices = params.disc * means
+    errs = params.disc * np.sqrt(variances / grid)
+    return grid, prices, errs
+
+@st.cache_data
+def _convergence_fig(grid, prices, errs, bs_price: float, kind: str):
+    # Import paresseux : plotly ne sert qu'à ce graphique
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_hline(y=bs_price, line_dash="dash", annotation_text="Black–Scholes")
+    fig.add_trace(go.Scatter(
+        x=grid, y=prices,
+        error_y=dict(type="data", array=errs),
+        mode="lines+markers", marker_size=5, name="Monte Carlo",
+    ))
+    fig.update_xaxes(type="log", title_text="Number of simulations (log scale)")
+    fig.update_yaxes(title_text="Estimated price")
+    fig.update_layout(title=f"Convergence ({kind.upper()})")
+    return fig
 
 
 st.set_page_config(page_title="Option Pricer", page_icon="📈", layout="centered")
@@ -30,10 +91,11 @@ n_sims = st.sidebar.number_input("Number of simulations", min_value=100, value=1
 seed = st.sidebar.number_input("Random seed", min_value=0, value=42, step=1)
 
 params = OptionParams(S=S, K=K, r=r, q=q, sigma=sigma, T=T)
+p_tuple = (S, K, r, q, sigma, T)
 
 # --- Analytical price ---
 st.subheader("Analytical — Black–Scholes")
-bs_price = black_scholes_price(params, kind)
+bs_price = _bs_cached(p_tuple, kind)
 col1, col2 = st.columns(2)
 with col1:
     st.metric(label=f"Price ({kind})", value=f"{bs_price:.6f}")
@@ -42,11 +104,7 @@ with col2:
 
 # --- Greeks ---
 st.subheader("Greeks (Analytical)")
-g_delta = delta(params, kind)
-g_gamma = gamma(params)
-g_vega  = vega(params)
-g_theta = theta(params, kind)
-g_rho   = rho(params, kind)
+g_delta, g_gamma, g_vega, g_theta, g_rho = _greeks_cached(p_tuple, kind)
 
 st.write(
     f"**Delta**: {g_delta:.6f}  |  "
@@ -58,7 +116,7 @@ st.write(
 
 # --- Monte Carlo price ---
 st.subheader("Monte Carlo")
-mc_price, mc_err = monte_carlo_price(params, kind, n_sims=int(n_sims), seed=int(seed))
+mc_price, mc_err = _mc_cached(p_tuple, kind, int(n_sims), int(seed))
 st.write(f"**MC Price**: {mc_price:.6f}  ±  {mc_err:.6f} (1σ)")
 
 diff = mc_price - bs_price
@@ -67,23 +125,6 @@ st.write(f"**Difference (MC − BS)**: {diff:.6f}")
 # --- Convergence demo (optional plot) ---
 with st.expander("Show convergence plot (Monte Carlo → Black–Scholes)"):
     max_power = st.slider("Max log10(n_sims)", min_value=2, max_value=6, value=5, step=1)
-    grid = np.unique((np.logspace(2, max_power, num=max_power*5)).astype(int))
-    prices = []
-    errs = []
-    for n in grid:
-        p, e = monte_carlo_price(params, kind, n_sims=int(n), seed=int(seed))
-        prices.append(p)
-        errs.append(e)
-    prices = np.array(prices)
-    errs = np.array(errs)
-
-    fig = plt.figure(figsize=(7, 4))
-    plt.axhline(bs_price, linestyle="--", label="Black–Scholes", linewidth=1.5)
-    plt.errorbar(grid, prices, yerr=errs, fmt="o-", markersize=3, linewidth=1, label="Monte Carlo")
-    plt.xscale("log")
-    plt.xlabel("Number of simulations (log scale)")
-    plt.ylabel("Estimated price")
-    plt.title(f"Convergence ({kind.upper()})")
-    plt.legend()
-    plt.grid(alpha=0.3)
-    st.pyplot(fig)
\ No newline at end of file
+    grid, prices, errs = _convergence_data(p_tuple, kind, int(seed), int(max_power))
+    fig = _convergence_fig(grid, prices, errs, float(bs_price), kind)
+    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -1,5 +1,16 @@
 from dataclasses import dataclass
+from functools import cached_property
 from math import exp, log, sqrt, erf, pi
+import numpy as np
+from scipy.special import ndtr, log_ndtr
+
+try:
+    from numba import vectorize
+    HAS_NUMBA = True
+except ImportError:  # Numba optionnel : repli scipy pur
+    HAS_NUMBA = False
+
+_SQRT2 = sqrt(2.0)
 
 # ---- Option parameters ----
 @dataclass(frozen=True)
@@ -11,10 +22,41 @@ class OptionParams:
     sigma: float  # volatility
     T: float      # maturity
 
+    # Quantités dérivées, calculées une seule fois par instance (le dataclass
+    # est gelé, elles ne peuvent pas devenir obsolètes)
+    @cached_property
+    def drift(self) -> float:
+        """Dérive risque-neutre du log-prix : (r - q - sigma²/2)·T."""
+        return (self.r - self.q - 0.5 * self.sigma**2) * self.T
+
+    @cached_property
+    def vol_sqrtT(self) -> float:
+        """Volatilité à l'échelle de la maturité : sigma·sqrt(T)."""
+        return self.sigma * sqrt(self.T)
+
+    @cached_property
+    def disc(self) -> float:
+        """Facteur d'actualisation exp(-rT)."""
+        return exp(-self.r * self.T)
+
 # ---- Normal distribution ----
 def std_norm_cdf(x: float):
-    """CDF de la loi normale standard."""
-    return 0.5 * (1.0 + erf(x / sqrt(2.0)))
+    """CDF de la loi normale standard (scipy.special.ndtr, routine C directe)."""
+    return float(ndtr(x))
+
+def std_norm_cdf_vec(x):
+    """CDF normale vectorisée (scipy.special.ndtr) pour les grilles NumPy."""
+    return ndtr(np.asarray(x, dtype=float))
+
+def std_norm_log_cdf(x):
+    """log de la CDF normale, scalaire ou vectorisé (scipy.special.log_ndtr).
+
+    Reste fini et précis dans la queue profonde (x < -38), là où la CDF
+    elle-même sous-dépasse vers 0.0 en double précision — à utiliser pour
+    tout calcul qui peut se faire en espace log (vraisemblances, solveurs
+    de volatilité implicite sur des options très hors de la monnaie).
+    """
+    return log_ndtr(x)
 
 def std_norm_pdf(x: float):
     """PDF de la loi normale standard."""
@@ -32,55 +74,125 @@ def d2(p: OptionParams, d1_val: float = None):
 def disc(rate: float, T: float):
     return exp(-rate * T)
 
-# ---- Black-Scholes prices ----
-def call_price(p: OptionParams):
+# ---- Contexte partagé ----
+@dataclass(frozen=True)
+class BSContext:
+    """Quantités communes (d1, d2, facteurs d'actualisation) calculées une seule fois."""
+    d1: float
+    d2: float
+    df_r: float     # exp(-r T)
+    df_q: float     # exp(-q T)
+    pdf_d1: float
+    sqrt_T: float
+
+def bs_context(p: OptionParams) -> BSContext:
+    sqrt_T = sqrt(p.T)
     d1v = d1(p)
-    d2v = d2(p, d1v)
-    return p.S * exp(-p.q * p.T) * std_norm_cdf(d1v) - p.K * exp(-p.r * p.T) * std_norm_cdf(d2v)
+    return BSContext(
+        d1=d1v,
+        d2=d1v - p.sigma * sqrt_T,
+        df_r=p.disc,
+        df_q=exp(-p.q * p.T),
+        pdf_d1=std_norm_pdf(d1v),
+        sqrt_T=sqrt_T,
+    )
 
-def put_price(p: OptionParams):
-    d1v = d1(p)
-    d2v = d2(p, d1v)
-    return p.K * exp(-p.r * p.T) * std_norm_cdf(-d2v) - p.S * exp(-p.q * p.T) * std_norm_cdf(-d1v)
+# ---- Black-Scholes prices ----
+def call_price(p: OptionParams, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    return p.S * ctx.df_q * std_norm_cdf(ctx.d1) - p.K * ctx.df_r * std_norm_cdf(ctx.d2)
+
+def put_price(p: OptionParams, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    # Parité call-put : put = call - S e^{-qT} + K e^{-rT}
+    return call_price(p, ctx) - p.S * ctx.df_q + p.K * ctx.df_r
 
 def black_scholes_price(p: OptionParams, kind: str):
     return call_price(p) if kind == "call" else put_price(p)
 
+# ---- Noyau compilé (Numba) ----
+if HAS_NUMBA:
+    # Pas de cache=True : le cache disque de Numba mémorise le nom de module
+    # qualifié et casserait ensuite l'exécution directe du fichier
+    # (python pricer_project/models/black_scholes.py), où le module s'appelle
+    # __main__ sans package parent.
+    @vectorize(["float64(float64, float64, float64, float64, float64, float64, boolean)"])
+    def _bs_price_kernel(S, K, r, q, sigma, T, is_call):
+        """Formule BS complète en un ufunc compilé : d1/d2, erf et actualisation
+        fusionnés dans une seule boucle machine, sans tableaux intermédiaires."""
+        sqrt_T = sqrt(T)
+        d1v = (log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+        d2v = d1v - sigma * sqrt_T
+        df_q = exp(-q * T)
+        df_r = exp(-r * T)
+        call = S * df_q * 0.5 * (1.0 + erf(d1v / _SQRT2)) \
+             - K * df_r * 0.5 * (1.0 + erf(d2v / _SQRT2))
+        if is_call:
+            return call
+        return call - S * df_q + K * df_r   # parité call-put
+
+def black_scholes_price_vec(S, K, r, q, sigma, T, kind: str):
+    """Version vectorisée : chaque paramètre peut être un scalaire ou un tableau
+    NumPy (broadcastés entre eux), pour pricer une grille en un seul appel."""
+    S, K, r, q, sigma, T = (np.asarray(x, dtype=float) for x in (S, K, r, q, sigma, T))
+    if HAS_NUMBA:
+        return _bs_price_kernel(S, K, r, q, sigma, T, kind == "call")
+    sqrt_T = np.sqrt(T)
+    d1v = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    d2v = d1v - sigma * sqrt_T
+    df_q = np.exp(-q * T)
+    df_r = np.exp(-r * T)
+    if kind == "call":
+        return S * df_q * std_norm_cdf_vec(d1v) - K * df_r * std_norm_cdf_vec(d2v)
+    return K * df_r * std_norm_cdf_vec(-d2v) - S * df_q * std_norm_cdf_vec(-d1v)
+
 # ---- Greeks ----
-def delta(p: OptionParams, kind: str):
-    d1v = d1(p)
+def delta(p: OptionParams, kind: str, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    nd1 = std_norm_cdf(ctx.d1)
     if kind == "call":
-        return exp(-p.q * p.T) * std_norm_cdf(d1v)
+        return ctx.df_q * nd1
     else:
-        return -exp(-p.q * p.T) * std_norm_cdf(-d1v)
+        # Parité : delta_put = delta_call - e^{-qT}
+        return ctx.df_q * (nd1 - 1.0)
 
-def gamma(p: OptionParams):
-    d1v = d1(p)
-    return exp(-p.q * p.T) * std_norm_pdf(d1v) / (p.S * p.sigma * sqrt(p.T))
+def gamma(p: OptionParams, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    return ctx.df_q * ctx.pdf_d1 / (p.S * p.sigma * ctx.sqrt_T)
 
-def vega(p: OptionParams):
-    d1v = d1(p)
-    return p.S * exp(-p.q * p.T) * std_norm_pdf(d1v) * sqrt(p.T)
+def vega(p: OptionParams, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    return p.S * ctx.df_q * ctx.pdf_d1 * ctx.sqrt_T
 
-def theta(p: OptionParams, kind: str):
-    d1v = d1(p)
-    d2v = d2(p, d1v)
-    part1 = - (p.S * exp(-p.q * p.T) * std_norm_pdf(d1v) * p.sigma) / (2 * sqrt(p.T))
+def theta(p: OptionParams, kind: str, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
+    part1 = - (p.S * ctx.df_q * ctx.pdf_d1 * p.sigma) / (2 * ctx.sqrt_T)
     if kind == "call":
-        part2 = -p.r * p.K * exp(-p.r * p.T) * std_norm_cdf(d2v)
-        part3 = p.q * p.S * exp(-p.q * p.T) * std_norm_cdf(d1v)
+        part2 = -p.r * p.K * ctx.df_r * std_norm_cdf(ctx.d2)
+        part3 = p.q * p.S * ctx.df_q * std_norm_cdf(ctx.d1)
         return part1 + part2 + part3
     else:
-        part2 = p.r * p.K * exp(-p.r * p.T) * std_norm_cdf(-d2v)
-        part3 = -p.q * p.S * exp(-p.q * p.T) * std_norm_cdf(-d1v)
+        part2 = p.r * p.K * ctx.df_r * std_norm_cdf(-ctx.d2)
+        part3 = -p.q * p.S * ctx.df_q * std_norm_cdf(-ctx.d1)
         return part1 + part2 + part3
 
-def rho(p: OptionParams, kind: str):
-    d2v = d2(p)
+def rho(p: OptionParams, kind: str, ctx: BSContext = None):
+    ctx = ctx if ctx is not None else bs_context(p)
     if kind == "call":
-        return p.K * p.T * exp(-p.r * p.T) * std_norm_cdf(d2v)
+        return p.K * p.T * ctx.df_r * std_norm_cdf(ctx.d2)
     else:
-        return -p.K * p.T * exp(-p.r * p.T) * std_norm_cdf(-d2v)
+        return -p.K * p.T * ctx.df_r * std_norm_cdf(-ctx.d2)
+
+def all_greeks(p: OptionParams, kind: str):
+    """Les cinq grecques en partageant un seul contexte (un seul calcul de d1/d2)."""
+    ctx = bs_context(p)
+    return (
+        delta(p, kind, ctx),
+        gamma(p, ctx),
+        vega(p, ctx),
+        theta(p, kind, ctx),
+        rho(p, kind, ctx),
+    )
 
 # ---- Test ----
 if __name__ == "__main__":
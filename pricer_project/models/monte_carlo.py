@@ -1,8 +1,26 @@
 from dataclasses import dataclass
 import numpy as np
 from math import exp, sqrt
+from scipy.special import ndtri
+from scipy.stats import qmc
 from .black_scholes import OptionParams
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # Numba optionnel : repli NumPy pur
+    HAS_NUMBA = False
+
+try:
+    from numba import cuda
+    from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_normal_float32
+    HAS_CUDA = cuda.is_available()
+except ImportError:
+    HAS_CUDA = False
+
+# Seuil en dessous duquel le transfert hôte <-> GPU coûte plus qu'il ne rapporte
+CUDA_MIN_SIMS = 1_000_000
+
 # ---- Monte Carlo parameters ----
 @dataclass(frozen=True)
 class MCParams:
@@ -10,28 +28,256 @@ class MCParams:
     seed: int = 42          # graine aléatoire pour reproductibilité
 
 # ---- Simulation du sous-jacent ----
-def simulate_paths(p: OptionParams, n_sims: int, seed: int = 42):
-    """Simule les valeurs finales S_T du sous-jacent sous la mesure risque-neutre."""
-    np.random.seed(seed)
-    Z = np.random.randn(n_sims)
-    drift = (p.r - p.q - 0.5 * p.sigma**2) * p.T
-    diffusion = p.sigma * sqrt(p.T) * Z
-    ST = p.S * np.exp(drift + diffusion)
+def spawn_rngs(seed: int, k: int):
+    """Crée k générateurs indépendants (flux Philox) à partir d'une même graine."""
+    seq = np.random.SeedSequence(seed)
+    return [np.random.Generator(np.random.Philox(child)) for child in seq.spawn(k)]
+
+def simulate_paths(p: OptionParams, n_sims: int, seed: int = 42, method: str = "pseudo",
+                   out: np.ndarray = None):
+    """Simule les valeurs finales S_T du sous-jacent sous la mesure risque-neutre.
+
+    Variables antithétiques : on tire n_sims // 2 normales et on utilise ±Z,
+    soit moitié moins de tirages et d'exponentielles pour une variance réduite.
+    Les deux moitiés du tableau renvoyé sont appariées (ST[i] avec ST[i + n//2]).
+
+    method="sobol" : suite de Sobol brouillée (scipy.stats.qmc) transformée en
+    normales par ndtri — erreur en ~O(1/N) au lieu de O(1/sqrt(N)). Pas
+    d'antithétique dans ce mode, la suite est déjà équilibrée.
+
+    out : tampon float32 pré-alloué recevant les S_T (évite une allocation par
+    appel sur les appels répétés) ; le tableau renvoyé en est une vue.
+
+    seed : entier, ou directement un Generator (p. ex. un flux de spawn_rngs).
+    """
+    base = np.float32(p.S * exp(p.drift))
+    if method == "sobol":
+        if out is None:
+            out = np.empty(n_sims, dtype=np.float32)
+        elif out.size < n_sims:
+            raise ValueError(f"out buffer too small: {out.size} < {n_sims}")
+        ST = out[:n_sims]
+        # Sobol n'est équilibrée que par puissances de 2 : on tire la
+        # puissance supérieure et on tronque.
+        m = max(int(np.ceil(np.log2(n_sims))), 1)
+        sampler = qmc.Sobol(d=1, scramble=True, seed=seed)
+        ST[:] = ndtri(sampler.random_base2(m).ravel()[:n_sims])
+        np.multiply(ST, np.float32(p.vol_sqrtT), out=ST)
+        np.exp(ST, out=ST)
+        np.multiply(ST, base, out=ST)
+        return ST
+    n_pairs = max(n_sims // 2, 1)
+    if out is None:
+        out = np.empty(2 * n_pairs, dtype=np.float32)
+    elif out.size < 2 * n_pairs:
+        raise ValueError(f"out buffer too small: {out.size} < {2 * n_pairs}")
+    ST = out[:2 * n_pairs]
+    rng = np.random.default_rng(seed)   # accepte un entier ou un Generator
+    Z = rng.standard_normal(n_pairs, dtype=np.float32)
+    np.multiply(Z, np.float32(p.vol_sqrtT), out=Z)
+    np.exp(Z, out=Z)                           # une seule exp par paire
+    np.multiply(Z, base, out=ST[:n_pairs])     # branche +Z
+    np.divide(base, Z, out=ST[n_pairs:])       # branche -Z (réciproque)
     return ST
 
+# ---- Noyau fusionné (Numba) ----
+# Nombre de blocs reproductibles du noyau : fixe (indépendant du nombre de
+# threads) pour que le même seed donne le même prix sur toute machine.
+MC_BLOCKS = 64
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mc_kernel(S, K, r, q, sigma, T, n_sims, block_seeds, is_call):
+        """Tirage + payoff + réduction en une seule passe, parallélisée par blocs.
+
+        Chaque bloc re-seede l'état RNG du thread qui l'exécute puis tire ses
+        paires en série : un np.random.seed avant le prange ne toucherait que
+        le thread appelant, les workers garderaient des états arbitraires.
+        """
+        vol_sqrtT = sigma * sqrt(T)
+        base = S * exp((r - q - 0.5 * sigma**2) * T)
+        n_pairs = max(n_sims // 2, 1)
+        n_blocks = block_seeds.shape[0]
+        s = 0.0
+        s2 = 0.0
+        for b in prange(n_blocks):
+            np.random.seed(block_seeds[b])
+            bs = 0.0
+            bs2 = 0.0
+            for i in range(b * n_pairs // n_blocks, (b + 1) * n_pairs // n_blocks):
+                z = np.random.standard_normal()
+                e = exp(vol_sqrtT * z)
+                ST_pos = base * e
+                ST_neg = base / e
+                if is_call:
+                    pay = 0.5 * (max(ST_pos - K, 0.0) + max(ST_neg - K, 0.0))
+                else:
+                    pay = 0.5 * (max(K - ST_pos, 0.0) + max(K - ST_neg, 0.0))
+                bs += pay
+                bs2 += pay * pay
+            s += bs
+            s2 += bs2
+        disc = exp(-r * T)
+        mean = s / n_pairs
+        var = max(s2 / n_pairs - mean**2, 0.0)
+        return disc * mean, disc * sqrt(var / n_pairs)
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mc_grid_kernel(S, K, r, q, sigma, T, grid, seeds, is_call):
+        """Prix + erreur-type pour toute une grille de tailles d'échantillon,
+        parallélisé sur les points de grille (un flux RNG par point, seeds
+        dérivés côté hôte par SeedSequence)."""
+        vol_sqrtT = sigma * sqrt(T)
+        base = S * exp((r - q - 0.5 * sigma**2) * T)
+        disc = exp(-r * T)
+        m = grid.shape[0]
+        prices = np.empty(m)
+        errs = np.empty(m)
+        for k in prange(m):
+            np.random.seed(seeds[k])
+            n_pairs = max(grid[k] // 2, 1)
+            s = 0.0
+            s2 = 0.0
+            for i in range(n_pairs):
+                z = np.random.standard_normal()
+                e = exp(vol_sqrtT * z)
+                ST_pos = base * e
+                ST_neg = base / e
+                if is_call:
+                    pay = 0.5 * (max(ST_pos - K, 0.0) + max(ST_neg - K, 0.0))
+                else:
+                    pay = 0.5 * (max(K - ST_pos, 0.0) + max(K - ST_neg, 0.0))
+                s += pay
+                s2 += pay * pay
+            mean = s / n_pairs
+            var = max(s2 / n_pairs - mean**2, 0.0)
+            prices[k] = disc * mean
+            errs[k] = disc * sqrt(var / n_pairs)
+        return prices, errs
+
+    # Warm-up à l'import : déclenche la compilation (ou le chargement du cache
+    # disque grâce à cache=True) pour que le premier vrai pricing soit déjà chaud.
+    # Si la compilation échoue (threading layer cassé, cache corrompu...), on
+    # retombe sur le chemin NumPy plutôt que de faire échouer l'import.
+    try:
+        _mc_kernel(100.0, 100.0, 0.05, 0.02, 0.2, 1.0, 2,
+                   np.random.SeedSequence(0).generate_state(MC_BLOCKS), True)
+        _mc_grid_kernel(100.0, 100.0, 0.05, 0.02, 0.2, 1.0, np.array([2], dtype=np.int64),
+                        np.random.SeedSequence(0).generate_state(1), True)
+    except Exception:
+        HAS_NUMBA = False
+
+# ---- Noyau GPU (Numba CUDA) ----
+if HAS_CUDA:
+    @cuda.jit
+    def _mc_kernel_cuda(rng_states, base, vol_sqrtT, K, is_call, n_pairs, partial_s, partial_s2):
+        """Chaque thread accumule ses paires antithétiques dans une somme partielle."""
+        tid = cuda.grid(1)
+        stride = cuda.gridsize(1)
+        s = 0.0
+        s2 = 0.0
+        for i in range(tid, n_pairs, stride):
+            z = xoroshiro128p_normal_float32(rng_states, tid)
+            e = exp(vol_sqrtT * z)
+            ST_pos = base * e
+            ST_neg = base / e
+            if is_call:
+                pay = 0.5 * (max(ST_pos - K, 0.0) + max(ST_neg - K, 0.0))
+            else:
+                pay = 0.5 * (max(K - ST_pos, 0.0) + max(K - ST_neg, 0.0))
+            s += pay
+            s2 += pay * pay
+        partial_s[tid] = s
+        partial_s2[tid] = s2
+
+    def _mc_price_cuda(p: OptionParams, kind: str, n_sims: int, seed: int):
+        threads, blocks = 256, 128
+        n_threads = threads * blocks
+        n_pairs = max(n_sims // 2, 1)
+        rng_states = create_xoroshiro128p_states(n_threads, seed=seed)
+        partial_s = cuda.device_array(n_threads, dtype=np.float64)
+        partial_s2 = cuda.device_array(n_threads, dtype=np.float64)
+        base = p.S * exp(p.drift)
+        _mc_kernel_cuda[blocks, threads](
+            rng_states, base, p.vol_sqrtT, p.K,
+            kind == "call", n_pairs, partial_s, partial_s2,
+        )
+        s = partial_s.copy_to_host().sum()
+        s2 = partial_s2.copy_to_host().sum()
+        mean = s / n_pairs
+        var = max(s2 / n_pairs - mean**2, 0.0)
+        return p.disc * mean, p.disc * sqrt(var / n_pairs)
+
+def _kahan_mean_var(x: np.ndarray, chunk: int = 4096):
+    """Moyenne et variance d'un tableau float32 par sommation compensée (Kahan).
+
+    Les blocs sont sommés vectoriellement ; les sommes partielles sont
+    accumulées avec compensation, ce qui évite la dérive d'un accumulateur
+    float32 naïf sur plusieurs millions de termes.
+    """
+    s = c = s2 = c2 = 0.0
+    for i in range(0, x.size, chunk):
+        b = x[i:i + chunk]
+        y = float(np.sum(b)) - c
+        t = s + y
+        c = (t - s) - y
+        s = t
+        y2 = float(np.sum(b * b)) - c2
+        t2 = s2 + y2
+        c2 = (t2 - s2) - y2
+        s2 = t2
+    mean = s / x.size
+    var = max(s2 / x.size - mean**2, 0.0)
+    return mean, var
+
 # ---- Monte Carlo pricing ----
-def monte_carlo_price(p: OptionParams, kind: str, n_sims: int = 100_000, seed: int = 42):
-    """Prix d'une option européenne (call/put) par Monte Carlo."""
-    ST = simulate_paths(p, n_sims, seed)
+def monte_carlo_price(p: OptionParams, kind: str, n_sims: int = 100_000, seed: int = 42,
+                      method: str = "pseudo"):
+    """Prix d'une option européenne (call/put) par Monte Carlo.
+
+    method="sobol" force le chemin quasi-Monte Carlo (voir simulate_paths) ;
+    l'erreur-type renvoyée est alors indicative, les tirages n'étant pas i.i.d.
+    """
+    if method == "pseudo":
+        if HAS_CUDA and n_sims >= CUDA_MIN_SIMS:
+            return _mc_price_cuda(p, kind, n_sims, seed)
+        if HAS_NUMBA:
+            block_seeds = np.random.SeedSequence(seed).generate_state(MC_BLOCKS)
+            return _mc_kernel(p.S, p.K, p.r, p.q, p.sigma, p.T, n_sims, block_seeds, kind == "call")
+    # Chemin NumPy vectorisé (repli sans Numba, ou méthode Sobol) ; le payoff
+    # écrase le tampon des S_T plutôt que d'allouer un deuxième tableau
+    payoffs = simulate_paths(p, n_sims, seed, method)
     if kind == "call":
-        payoffs = np.maximum(ST - p.K, 0)
+        np.subtract(payoffs, np.float32(p.K), out=payoffs)
     else:
-        payoffs = np.maximum(p.K - ST, 0)
-    discounted_payoffs = exp(-p.r * p.T) * payoffs
-    price = np.mean(discounted_payoffs)
-    stderr = np.std(discounted_payoffs) / sqrt(n_sims)
+        np.subtract(np.float32(p.K), payoffs, out=payoffs)
+    np.maximum(payoffs, np.float32(0.0), out=payoffs)
+    if method == "sobol":
+        samples = payoffs
+        n_eff = len(samples)
+    else:
+        # Moyenne par paire antithétique : l'écart-type doit porter sur les paires
+        n_eff = len(payoffs) // 2
+        samples = 0.5 * (payoffs[:n_eff] + payoffs[n_eff:])
+    mean, var = _kahan_mean_var(samples)
+    price = p.disc * mean
+    stderr = p.disc * sqrt(var / n_eff)
     return price, stderr
 
+def monte_carlo_price_grid(p: OptionParams, kind: str, n_sims_list, seed: int = 42):
+    """Prix MC pour plusieurs tailles d'échantillon en un seul appel parallèle."""
+    grid = np.asarray(n_sims_list, dtype=np.int64)
+    if HAS_NUMBA:
+        # Un seed indépendant par point de grille, dérivés par SeedSequence
+        seeds = np.random.SeedSequence(seed).generate_state(len(grid))
+        return _mc_grid_kernel(p.S, p.K, p.r, p.q, p.sigma, p.T, grid, seeds, kind == "call")
+    # Un flux Philox indépendant par point de grille (voir spawn_rngs)
+    rngs = spawn_rngs(seed, len(grid))
+    results = [monte_carlo_price(p, kind, int(n), rng) for rng, n in zip(rngs, grid)]
+    prices, errs = zip(*results)
+    return np.array(prices), np.array(errs)
+
 # ---- Test rapide ----
 if __name__ == "__main__":
     p = OptionParams(S=100, K=100, r=0.05, q=0.02, sigma=0.2, T=1)
@@ -1,20 +1,12 @@
-import numpy as np
 import matplotlib.pyplot as plt
 from pricer_project.models.black_scholes import OptionParams, black_scholes_price
-from pricer_project.models.monte_carlo import monte_carlo_price
+from pricer_project.models.monte_carlo import monte_carlo_price_grid
 
 
 def compare_mc_vs_bs(p: OptionParams, kind: str, n_sims_list: list[int]):
     bs_price = black_scholes_price(p, kind)
-    mc_prices, mc_errors = [], []
-
-    for n in n_sims_list:
-        price, err = monte_carlo_price(p, kind, n_sims=n)
-        mc_prices.append(price)
-        mc_errors.append(err)
-
-    mc_prices = np.array(mc_prices)
-    mc_errors = np.array(mc_errors)
+    # Toute la grille en un appel : parallélisé sur les points de grille
+    mc_prices, mc_errors = monte_carlo_price_grid(p, kind, n_sims_list)
     biases = mc_prices - bs_price
 
     return bs_price, mc_prices, mc_errors, biases